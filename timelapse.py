@@ -1,25 +1,52 @@
 #!/usr/bin/env python3
 """
 Chronapse Timelapse Recorder
-Captures frames from webcam at specified intervals and compiles them into a video.
+Captures frames from webcam at specified intervals and streams them into a video.
 """
 
 import argparse
 import cv2
+import numpy as np
 import os
 import sys
 import signal
 import time
 import subprocess
-import shutil
+import queue
+import threading
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
 
+# ffmpeg binary used for probing and encoding
+# FFMPEG = 'ffmpeg'
+FFMPEG = '/usr/bin/ffmpeg'
+
+# Presets accepted by libx264, fastest first
+X264_PRESETS = (
+    'ultrafast', 'superfast', 'veryfast', 'faster', 'fast',
+    'medium', 'slow', 'slower', 'veryslow',
+)
+
+# x264 preset used when none is given explicitly
+DEFAULT_X264_PRESET = 'veryfast'
+
+# Hardware H.264 encoders to try before falling back to libx264, in order
+HW_ENCODERS = ('h264_nvenc', 'h264_vaapi')
+
+# Render node used for VAAPI encoding
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# Number of buffers V4L2 queues when the backend won't report it
+DEFAULT_V4L2_BUFFERS = 4
+
+
 class TimelapseRecorder:
-    """Handles webcam frame capture and video compilation."""
+    """Handles webcam frame capture and video encoding."""
 
-    def __init__(self, interval, duration, output_path, fps=30, camera_index=0):
+    def __init__(self, interval, duration, output_path, fps=30, camera_index=0, preset=None,
+                 encoder='auto', ffmpeg_capture=False):
         """
         Initialize the timelapse recorder.
 
@@ -29,20 +56,46 @@ class TimelapseRecorder:
             output_path: Path for the output video file
             fps: Frames per second for the output video
             camera_index: Webcam device index (default 0 for /dev/video0)
+            preset: x264 encoding preset (speed vs. compression tradeoff),
+                or None for the default
+            encoder: H.264 encoder to use, or 'auto' to prefer available hardware
+            ffmpeg_capture: Let ffmpeg read the camera directly instead of OpenCV
         """
         self.interval = interval
         self.duration = duration
         self.output_path = Path(output_path)
         self.fps = fps
         self.camera_index = camera_index
-        self.frames_dir = Path("frames")
+        self.preset = preset
+        self.encoder = encoder
+        self.ffmpeg_capture = ffmpeg_capture
         self.camera = None
-        self.should_stop = False
+        self.ffmpeg = None
+        self.frame_width = 1920
+        self.frame_height = 1080
+        self.camera_fps = 30
+        self.buffered_frames = DEFAULT_V4L2_BUFFERS
+        self.last_grab_time = None
+        self.frame_pool = []
+        self.pool_index = 0
+        self.writer = None
+        self.stderr_reader = None
+        self.ffmpeg_errors = deque(maxlen=20)
+        self.frames_encoded = 0
+        self.finalizing = False
+
+        # Small bound applies backpressure if the encoder falls behind
+        self.write_q = queue.Queue(maxsize=2)
+        self._stop_event = threading.Event()
         self.frames_captured = 0
 
         # Calculate expected frame count
         self.expected_frames = int(duration / interval)
 
+        # Progress lines bypass print() and go straight to the stdout fd
+        self._progress_tmpl = b"[PROGRESS] %d/%d (%.1f%%)\n"
+        self._stdout_fd = sys.stdout.fileno()
+
         # Setup signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -50,7 +103,10 @@ class TimelapseRecorder:
     def _signal_handler(self, signum, frame):
         """Handle interrupt signals gracefully."""
         print("\n[INFO] Received stop signal. Finishing recording...", flush=True)
-        self.should_stop = True
+
+        # The interrupted main thread may hold the event's lock inside wait(),
+        # so setting it here could deadlock; do it from another thread instead
+        threading.Thread(target=self._stop_event.set, daemon=True).start()
 
     def _initialize_camera(self):
         """Initialize the webcam connection."""
@@ -62,52 +118,280 @@ class TimelapseRecorder:
         if not self.camera.isOpened():
             raise RuntimeError(f"Failed to open camera /dev/video{self.camera_index}")
 
+        # Keep only the newest frame queued so reads are not seconds old
+        if not self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("[WARNING] Camera backend ignored buffer size, frames may be stale", flush=True)
+
+        # MJPG needs a fraction of YUYV's USB bandwidth at 1080p, which keeps
+        # UVC cameras from dropping their frame rate; must precede the resolution
+        if not self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG')):
+            print("[WARNING] Camera does not support MJPG, using its default format", flush=True)
+
         # Set camera properties for better quality
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
+        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
+        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
         self.camera.set(cv2.CAP_PROP_FPS, 30)
 
+        # Needed to work out how many stale frames queue up between captures
+        self.camera_fps = self.camera.get(cv2.CAP_PROP_FPS) or 30
+        buffered = int(self.camera.get(cv2.CAP_PROP_BUFFERSIZE))
+        if buffered > 0:
+            self.buffered_frames = buffered
+
         # Warm up camera with a test frame
-        ret, _ = self.camera.read()
+        ret, frame = self.camera.read()
         if not ret:
             raise RuntimeError("Failed to capture test frame from camera")
+        self.last_grab_time = time.monotonic()
+
+        # The camera may not support the requested resolution; encode what it delivers
+        height, width = frame.shape[:2]
+        if (width, height) != (self.frame_width, self.frame_height):
+            print(f"[WARNING] Camera delivers {width}x{height} instead of "
+                  f"{self.frame_width}x{self.frame_height}", flush=True)
+            self.frame_width, self.frame_height = width, height
+
+        print(f"[INFO] Camera format: {width}x{height} at {self.camera_fps:g} FPS", flush=True)
+
+        # Frames are retrieved into reused buffers instead of a fresh array each time.
+        # Up to maxsize frames sit in the queue, one is being written and one is
+        # being filled, so this many buffers are never overwritten while in use.
+        pool_size = self.write_q.maxsize + 2
+        self.frame_pool = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(pool_size)]
 
         print("[INFO] Camera initialized successfully", flush=True)
 
-    def _setup_frames_directory(self):
-        """Create a clean frames directory."""
-        if self.frames_dir.exists():
-            print(f"[INFO] Cleaning existing frames directory...", flush=True)
-            shutil.rmtree(self.frames_dir)
+    def _encoder_args(self, encoder, filters=()):
+        """
+        Build the ffmpeg arguments for an H.264 encoder.
+
+        Args:
+            encoder: ffmpeg encoder name
+            filters: Video filters to run before encoding
+
+        Returns:
+            tuple: (global options, output encoding options)
+        """
+        filters = list(filters)
+        global_args = []
+
+        if encoder == 'h264_nvenc':
+            codec_args = ['-c:v', 'h264_nvenc', '-preset', 'p4', '-cq', '23', '-pix_fmt', 'yuv420p']
+        elif encoder == 'h264_vaapi':
+            # Frames are converted on the CPU and uploaded to the GPU surface
+            global_args = ['-vaapi_device', VAAPI_DEVICE]
+            filters += ['format=nv12', 'hwupload']
+            codec_args = ['-c:v', 'h264_vaapi', '-qp', '23']
+        else:
+            codec_args = [
+                '-c:v', 'libx264',
+                '-preset', self.preset or DEFAULT_X264_PRESET,
+                '-crf', '23',  # Quality factor (lower = better quality)
+                '-pix_fmt', 'yuv420p',  # Compatibility with most players
+            ]
+
+        if filters:
+            codec_args = ['-vf', ','.join(filters)] + codec_args
+
+        return global_args, codec_args
+
+    def _probe_encoder(self, encoder):
+        """
+        Check whether ffmpeg can actually encode with the given encoder.
+
+        Args:
+            encoder: ffmpeg encoder name
+
+        Returns:
+            bool: True if a short test encode succeeded
+        """
+        global_args, codec_args = self._encoder_args(encoder)
+
+        # Being listed only means ffmpeg was built with it, so try a tiny encode
+        probe_cmd = [
+            FFMPEG, '-hide_banner', '-loglevel', 'error',
+            *global_args,
+            '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+            *codec_args,
+            '-f', 'null', '-'
+        ]
+
+        try:
+            result = subprocess.run(probe_cmd, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+
+        return result.returncode == 0
+
+    def _select_encoder(self):
+        """Resolve 'auto' to the first working hardware encoder, else libx264."""
+        if self.encoder == 'auto':
+            self.encoder = self._detect_hw_encoder() or 'libx264'
+
+        print(f"[INFO] Using video encoder: {self.encoder}", flush=True)
+
+        # Only worth mentioning if the user actually asked for a preset
+        if self.preset is not None and self.encoder != 'libx264':
+            print(f"[INFO] Preset '{self.preset}' only applies to libx264; "
+                  f"pass --encoder libx264 to use it", flush=True)
+
+    def _detect_hw_encoder(self):
+        """
+        Find the first hardware encoder that ffmpeg lists and can use.
+
+        Returns:
+            str: Encoder name, or None if none works
+        """
+        try:
+            result = subprocess.run([FFMPEG, '-hide_banner', '-encoders'],
+                                    capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+
+        for encoder in HW_ENCODERS:
+            if encoder in result.stdout and self._probe_encoder(encoder):
+                return encoder
+
+        return None
+
+    def _start_encoder(self):
+        """Spawn ffmpeg to encode raw frames piped through its stdin."""
+        print(f"[INFO] Starting video encoder for {self.output_path}...", flush=True)
+
+        # Raw BGR frames from stdin
+        self._launch_ffmpeg([
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgr24',  # OpenCV frame layout
+            '-s', f'{self.frame_width}x{self.frame_height}',
+            '-framerate', str(self.fps),
+            '-i', '-',
+        ])
+
+    def _launch_ffmpeg(self, input_args, filters=()):
+        """
+        Spawn ffmpeg encoding the given input into the output video.
+
+        Args:
+            input_args: ffmpeg input options, ending with -i
+            filters: Video filters to run before encoding
+        """
+        # Ensure output directory exists
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        global_args, codec_args = self._encoder_args(self.encoder, filters)
+
+        # Build ffmpeg command
+        ffmpeg_cmd = [
+            FFMPEG,
+            '-y',  # Overwrite output file if it exists
+            '-loglevel', 'error',
+            '-nostats',
+            '-progress', 'pipe:2',  # key=value progress on stderr
+            *global_args,
+            *input_args,
+            *codec_args,
+            '-r', str(self.fps),  # Output rate, otherwise mp4 falls back to 25 FPS
+            '-movflags', '+faststart',  # Put the index first for streaming playback
+            '-threads', '0',  # Let the encoder use all cores
+            str(self.output_path)
+        ]
+
+        try:
+            # Own session so a terminal Ctrl+C reaches only us; we finalize ffmpeg
+            self.ffmpeg = subprocess.Popen(
+                ffmpeg_cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                start_new_session=True
+            )
+        except FileNotFoundError:
+            raise RuntimeError("FFmpeg not found. Please install it: sudo apt install ffmpeg")
+
+        # stderr has to be drained continuously or ffmpeg blocks on it
+        self.stderr_reader = threading.Thread(target=self._stderr_loop, daemon=True)
+        self.stderr_reader.start()
+
+    def _stderr_loop(self):
+        """Parse ffmpeg progress from stderr and keep the latest error lines."""
+        try:
+            for raw in self.ffmpeg.stderr:
+                line = raw.decode(errors='replace').strip()
+                key, sep, value = line.partition('=')
+
+                # Progress entries are bare key=value pairs, anything else is a log line
+                if not sep or ' ' in key:
+                    if line:
+                        self.ffmpeg_errors.append(line)
+                    continue
+
+                if key == 'frame' and value.isdigit():
+                    self.frames_encoded = int(value)
+
+                    # When ffmpeg captures, every encoded frame is a captured one
+                    if self.ffmpeg_capture and not self.finalizing:
+                        if self.frames_encoded != self.frames_captured:
+                            self.frames_captured = self.frames_encoded
+                            self._report_progress(self.frames_captured, self.expected_frames)
+
+                    # Capture progress covers recording; report encoding while finalizing
+                    elif self.finalizing:
+                        self._report_progress(self.frames_encoded, self.frames_captured)
+        except Exception:
+            # Nobody drains stderr anymore, so ffmpeg would eventually block on it
+            self.ffmpeg.kill()
+            raise
+        finally:
+            # ffmpeg exited, so nothing more can be recorded; reap it first so
+            # whoever wakes up sees its exit code
+            self.ffmpeg.wait()
+            self._stop_event.set()
+
+    def _report_progress(self, current, total):
+        """
+        Emit a progress line that the Go TUI can parse.
 
-        self.frames_dir.mkdir(exist_ok=True)
-        print(f"[INFO] Created frames directory: {self.frames_dir}", flush=True)
+        Args:
+            current: Frames done so far
+            total: Frames expected in total
+        """
+        # interval > duration leaves nothing expected
+        progress = (current / total) * 100 if total else 100.0
+        os.write(self._stdout_fd, self._progress_tmpl % (current, total, progress))
 
     def _capture_frame(self, frame_number):
         """
         Capture a single frame from the camera.
 
         Args:
-            frame_number: Sequential frame number for filename
+            frame_number: Sequential frame number for log messages
 
         Returns:
             bool: True if capture was successful
         """
-        ret, frame = self.camera.read()
+        # Frames the driver queued since the last capture are stale; grab()
+        # skips them without paying for the color conversion in retrieve()
+        now = time.monotonic()
+        stale = int((now - self.last_grab_time) * self.camera_fps)
+        for _ in range(min(stale, self.buffered_frames) + 1):
+            self.camera.grab()
+        self.last_grab_time = time.monotonic()
+
+        buf = self.frame_pool[self.pool_index]
+        self.pool_index = (self.pool_index + 1) % len(self.frame_pool)
+        ret, frame = self.camera.retrieve(buf)
 
         if not ret:
             print(f"[ERROR] Failed to capture frame {frame_number}", flush=True)
             return False
 
-        # Save frame with zero-padded filename for proper sorting
-        frame_path = self.frames_dir / f"frame_{frame_number:06d}.jpg"
-        cv2.imwrite(str(frame_path), frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+        # Writer thread pipes the frame to ffmpeg while we wait for the next one
+        self.write_q.put(frame)
 
         self.frames_captured += 1
 
-        # Progress output that Go TUI can parse
-        progress = (self.frames_captured / self.expected_frames) * 100
-        print(f"[PROGRESS] {self.frames_captured}/{self.expected_frames} ({progress:.1f}%)", flush=True)
+        self._report_progress(self.frames_captured, self.expected_frames)
 
         return True
 
@@ -116,11 +400,12 @@ class TimelapseRecorder:
         print(f"[INFO] Starting recording: {self.expected_frames} frames over {self.duration}s", flush=True)
         print(f"[INFO] Capture interval: {self.interval}s", flush=True)
 
-        start_time = time.time()
+        # Monotonic clock keeps the schedule immune to wall-clock jumps
+        start_time = time.monotonic()
         frame_number = 0
 
-        while not self.should_stop:
-            current_time = time.time()
+        while not self._stop_event.is_set():
+            current_time = time.monotonic()
             elapsed = current_time - start_time
 
             # Check if we've reached the duration limit
@@ -134,77 +419,159 @@ class TimelapseRecorder:
 
             # Calculate next capture time
             next_capture_time = start_time + (frame_number * self.interval)
-            sleep_time = next_capture_time - time.time()
+            sleep_time = next_capture_time - time.monotonic()
 
-            # Sleep until next capture, checking for stop signal
+            # Sleep until next capture; a stop signal wakes us immediately
             if sleep_time > 0:
-                # Break sleep into smaller chunks to respond faster to signals
-                sleep_chunks = int(sleep_time / 0.1) + 1
-                for _ in range(sleep_chunks):
-                    if self.should_stop:
-                        break
-                    time.sleep(min(0.1, sleep_time))
-                    sleep_time -= 0.1
-
-        actual_duration = time.time() - start_time
+                self._stop_event.wait(sleep_time)
+
+        actual_duration = time.monotonic() - start_time
         print(f"[INFO] Recording complete: {self.frames_captured} frames in {actual_duration:.1f}s", flush=True)
 
-    def _compile_video(self):
-        """Compile captured frames into a video using ffmpeg."""
+    def _record_with_ffmpeg(self):
+        """
+        Record and encode in a single ffmpeg process reading the camera directly.
+
+        Returns:
+            bool: True if the video was created successfully
+        """
+        print(f"[INFO] Starting ffmpeg capture: {self.expected_frames} frames over {self.duration}s", flush=True)
+        print(f"[INFO] Capture interval: {self.interval}s", flush=True)
+
+        start_time = time.monotonic()
+
+        # Without OpenCV there is no format negotiation, so size and rate are
+        # fixed requests. The fps filter keeps one frame per interval; retiming them to the
+        # output frame rate turns the kept frames into the timelapse
+        self._launch_ffmpeg([
+            '-f', 'v4l2',
+            '-input_format', 'mjpeg',  # YUYV at 1080p starves USB 2.0 cameras
+            '-framerate', str(self.camera_fps),
+            '-video_size', f'{self.frame_width}x{self.frame_height}',
+            '-t', str(self.duration),
+            '-i', f'/dev/video{self.camera_index}',
+        ], filters=[
+            f'fps=1/{self.interval}',
+            'settb=AVTB',
+            f'setpts=N/{self.fps}/TB',
+        ])
+
+        # Set by the signal handler, or by the stderr reader once ffmpeg exits
+        self._stop_event.wait()
+
+        # Ask ffmpeg to stop early and finalize the file
+        if self.ffmpeg.poll() is None:
+            try:
+                self.ffmpeg.stdin.write(b'q')
+                self.ffmpeg.stdin.flush()
+            except BrokenPipeError:
+                pass
+
+        returncode = self.ffmpeg.wait()
+        self.stderr_reader.join()
+
+        if returncode != 0:
+            return self._fail_video(f"FFmpeg failed: {' '.join(self.ffmpeg_errors)}")
+
+        actual_duration = time.monotonic() - start_time
+        print(f"[INFO] Recording complete: {self.frames_captured} frames in {actual_duration:.1f}s", flush=True)
+
+        return self._finish_video()
+
+    def _start_writer(self):
+        """Start the thread that pipes queued frames into ffmpeg."""
+        self.writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer.start()
+
+    def _writer_loop(self):
+        """Write queued frames to the encoder until a None sentinel arrives."""
+        stdin = self.ffmpeg.stdin
+        broken = False
+
+        while True:
+            frame = self.write_q.get()
+            if frame is None:
+                break
+
+            # Keep draining after a failure so the capture loop never blocks
+            if broken:
+                continue
+
+            try:
+                stdin.write(frame.data)
+            except BrokenPipeError:
+                print("[ERROR] FFmpeg exited unexpectedly, stopping recording", flush=True)
+                self._stop_event.set()
+                broken = True
+
+    def _stop_writer(self):
+        """Flush remaining frames to the encoder and wait for the writer thread."""
+        if self.writer is not None:
+            self.write_q.put(None)
+            self.writer.join()
+            self.writer = None
+
+    def _finish_video(self):
+        """Close the encoder input and wait for ffmpeg to finalize the video."""
         if self.frames_captured < 2:
-            print("[ERROR] Not enough frames to create video (minimum 2 required)", flush=True)
-            return False
+            return self._fail_video("Not enough frames to create video (minimum 2 required)")
 
-        print(f"[INFO] Compiling video with {self.frames_captured} frames at {self.fps} FPS...", flush=True)
+        print(f"[INFO] Finalizing video with {self.frames_captured} frames at {self.fps} FPS...", flush=True)
 
-        # Ensure output directory exists
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Closing stdin lets ffmpeg flush the remaining frames and write the trailer
+        self.finalizing = True
+        returncode = self._close_encoder()
 
-        # Build ffmpeg command
-        ffmpeg_cmd = [
-            # 'ffmpeg',
-            '/usr/bin/ffmpeg',
-            '-y',  # Overwrite output file if it exists
-            '-framerate', str(self.fps),
-            '-pattern_type', 'glob',
-            '-i', str(self.frames_dir / 'frame_*.jpg'),
-            '-c:v', 'libx264',
-            # '-preset', 'medium',
-            '-crf', '23',  # Quality factor (lower = better quality)
-            '-pix_fmt', 'yuv420p',  # Compatibility with most players
-            str(self.output_path)
-        ]
+        if returncode != 0:
+            return self._fail_video(f"FFmpeg failed: {' '.join(self.ffmpeg_errors)}")
 
-        try:
-            # Run ffmpeg with suppressed output except errors
-            result = subprocess.run(
-                ffmpeg_cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+        print(f"[SUCCESS] Video saved to: {self.output_path.absolute()}", flush=True)
 
-            print(f"[SUCCESS] Video saved to: {self.output_path.absolute()}", flush=True)
+        # Get output file size
+        file_size = self.output_path.stat().st_size / (1024 * 1024)  # MB
+        print(f"[INFO] Output file size: {file_size:.2f} MB", flush=True)
 
-            # Get output file size
-            file_size = self.output_path.stat().st_size / (1024 * 1024)  # MB
-            print(f"[INFO] Output file size: {file_size:.2f} MB", flush=True)
+        return True
 
-            return True
+    def _fail_video(self, message):
+        """
+        Report a failure, stop the encoder and remove the unusable output.
 
-        except subprocess.CalledProcessError as e:
-            print(f"[ERROR] FFmpeg failed: {e.stderr}", flush=True)
-            return False
-        except FileNotFoundError:
-            print("[ERROR] FFmpeg not found. Please install it: sudo apt install ffmpeg", flush=True)
-            return False
+        Args:
+            message: Error description to print
+
+        Returns:
+            bool: Always False, for use as a return value
+        """
+        print(f"[ERROR] {message}", flush=True)
+        self._stop_encoder()
+        self.output_path.unlink(missing_ok=True)
+        return False
+
+    def _close_encoder(self):
+        """
+        Close the encoder input and wait for ffmpeg to exit.
+
+        Returns:
+            int: ffmpeg exit code
+        """
+        try:
+            self.ffmpeg.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        returncode = self.ffmpeg.wait()
+        self.stderr_reader.join()
+        self.stderr_reader = None
+        self.ffmpeg = None
+
+        return returncode
 
-    def _cleanup_frames(self):
-        """Remove temporary frames directory."""
-        if self.frames_dir.exists():
-            print(f"[INFO] Cleaning up frames directory...", flush=True)
-            shutil.rmtree(self.frames_dir)
-            print("[INFO] Cleanup complete", flush=True)
+    def _stop_encoder(self):
+        """Terminate the encoder if it is still running."""
+        if self.ffmpeg is not None:
+            self.ffmpeg.kill()
+            self._close_encoder()
 
     def _release_camera(self):
         """Release the camera resource."""
@@ -215,35 +582,44 @@ class TimelapseRecorder:
     def run(self):
         """Execute the complete timelapse recording workflow."""
         try:
+            if self.ffmpeg_capture:
+                self._select_encoder()
+                return 0 if self._record_with_ffmpeg() else 1
+
             # Setup phase
-            self._setup_frames_directory()
             self._initialize_camera()
+            self._select_encoder()
+            self._start_encoder()
+            self._start_writer()
 
             # Recording phase
             self._record_frames()
 
-            # Always release camera before compilation
+            # Always release camera before finalizing
             self._release_camera()
+            self._stop_writer()
 
-            # Compilation phase
-            if self.frames_captured > 0:
-                success = self._compile_video()
-
-                # Cleanup phase
-                self._cleanup_frames()
+            # ffmpeg exiting before its input was closed means encoding failed
+            if self.ffmpeg.poll() is not None:
+                self._fail_video(f"FFmpeg failed: {' '.join(self.ffmpeg_errors)}")
+                return 1
 
+            # Finalization phase
+            if self.frames_captured > 0:
+                success = self._finish_video()
                 return 0 if success else 1
             else:
-                print("[ERROR] No frames captured", flush=True)
-                self._cleanup_frames()
+                self._fail_video("No frames captured")
                 return 1
 
         except Exception as e:
             print(f"[ERROR] Unexpected error: {e}", flush=True)
             return 1
         finally:
-            # Ensure camera is always released
+            # Ensure camera and encoder are always released
             self._release_camera()
+            self._stop_writer()
+            self._stop_encoder()
 
 
 def parse_arguments():
@@ -288,6 +664,29 @@ def parse_arguments():
         help='Camera device index'
     )
 
+    parser.add_argument(
+        '-p', '--preset',
+        type=str,
+        default=None,
+        choices=X264_PRESETS,
+        help=f'x264 encoding preset (faster presets use less CPU; {DEFAULT_X264_PRESET} if unset)'
+    )
+
+    parser.add_argument(
+        '-e', '--encoder',
+        type=str,
+        default='auto',
+        choices=('auto', 'libx264') + HW_ENCODERS,
+        help='H.264 encoder (auto prefers a working hardware encoder)'
+    )
+
+    parser.add_argument(
+        '--ffmpeg-capture',
+        action='store_true',
+        help='Capture with ffmpeg\'s v4l2 input instead of OpenCV (suits short intervals); '
+             'requests MJPG at 1920x1080 and 30 FPS without negotiating a fallback'
+    )
+
     return parser.parse_args()
 
 
@@ -316,7 +715,10 @@ def main():
         duration=args.duration,
         output_path=args.output,
         fps=args.fps,
-        camera_index=args.camera
+        camera_index=args.camera,
+        preset=args.preset,
+        encoder=args.encoder,
+        ffmpeg_capture=args.ffmpeg_capture
     )
 
     exit_code = recorder.run()